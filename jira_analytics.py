@@ -7,20 +7,23 @@ app = marimo.App(width="medium")
 @app.cell
 def __():
     import marimo as mo
+    import asyncio
     import duckdb
     import pandas as pd
     import plotly.express as px
     import plotly.graph_objects as go
     from plotly.subplots import make_subplots
+    import functools
     import json
-    import subprocess
     import sys
     import os
     from datetime import datetime, timedelta
 
     return (
+        asyncio,
         datetime,
         duckdb,
+        functools,
         go,
         json,
         make_subplots,
@@ -28,7 +31,6 @@ def __():
         os,
         pd,
         px,
-        subprocess,
         sys,
         timedelta,
     )
@@ -121,23 +123,37 @@ def __():
     return incremental_update, refresh_date_range, refresh_project
 
 
+@app.cell
+def __(mo):
+    # Refresh status is kept in state so the background refresh task can
+    # report back without blocking the notebook
+    get_refresh_status, set_refresh_status = mo.state("")
+    refresh_timer = mo.ui.refresh(default_interval="2s")
+
+    # The running refresh task; a plain dict so it survives re-runs of the
+    # trigger cell without marimo treating it as state
+    refresh_job = {"task": None}
+    return get_refresh_status, refresh_job, refresh_timer, set_refresh_status
+
+
+@app.cell
+def __(get_refresh_status):
+    refresh_status = get_refresh_status()
+    return (refresh_status,)
+
+
 @app.cell
 def __(
     auth_method,
-    datetime,
-    incremental_update,
     jira_url,
     mo,
     password_input,
-    refresh_date_range,
     refresh_project,
-    subprocess,
-    sys,
     token_input,
     username_input,
 ):
-    # Data refresh trigger
-    refresh_button = mo.ui.button(
+    # Data refresh trigger (true only for the run its click triggers)
+    refresh_button = mo.ui.run_button(
         label="🔄 Refresh JIRA Data",
         kind="success",
         disabled=not (
@@ -155,71 +171,128 @@ def __(
             )
         ),
     )
+    return (refresh_button,)
 
-    # State to track refresh status
-    refresh_status = mo.ui.text(value="", disabled=True)
 
-    if refresh_button.value:
+@app.cell
+def __(
+    asyncio,
+    auth_method,
+    datetime,
+    incremental_update,
+    jira_url,
+    password_input,
+    refresh_button,
+    refresh_date_range,
+    refresh_job,
+    refresh_project,
+    set_refresh_status,
+    sys,
+    token_input,
+    username_input,
+):
+    async def run_refresh(cmd):
+        """Run the extractor without blocking the notebook; returns a status"""
         try:
-            # Build command arguments
-            cmd = [sys.executable, "jira_extractor.py"]
-
-            # Add URL
-            cmd.extend(["--url", jira_url.value])
-
-            # Add authentication
-            if auth_method.value == "token":
-                cmd.extend(["--token", token_input.value])
-            else:
-                cmd.extend(
-                    [
-                        "--username",
-                        username_input.value,
-                        "--password",
-                        password_input.value,
-                    ]
-                )
-
-            # Add project
-            cmd.extend(["--project", refresh_project.value])
-
-            # Add date range if specified
-            if refresh_date_range.value:
-                start_date, end_date = refresh_date_range.value
-                cmd.extend(
-                    [
-                        "--start-date",
-                        start_date.strftime("%Y-%m-%d"),
-                        "--end-date",
-                        end_date.strftime("%Y-%m-%d"),
-                    ]
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                _, stderr = await asyncio.wait_for(
+                    proc.communicate(), timeout=300  # 5 minute timeout
                 )
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return "⏱️ Refresh timed out after 5 minutes"
 
-            # Add incremental flag
-            if incremental_update.value:
-                cmd.append("--incremental")
+            if proc.returncode == 0:
+                return f"✅ Data refresh completed successfully! {datetime.now().strftime('%H:%M:%S')}"
+            return f"❌ Refresh failed: {stderr.decode(errors='replace')}"
 
-            # Execute the command
-            refresh_status._update("🔄 Refreshing data from JIRA...")
+        except Exception as e:
+            return f"❌ Error during refresh: {str(e)}"
+
+    # Editing the settings re-runs this cell; only a click starts a refresh,
+    # and never while one is still running
+    _task = refresh_job["task"]
+    _running = _task is not None and not _task.done()
+    if refresh_button.value and not _running:
+        # Build command arguments
+        cmd = [sys.executable, "jira_extractor.py"]
+
+        # Add URL
+        cmd.extend(["--url", jira_url.value])
+
+        # Add authentication
+        if auth_method.value == "token":
+            cmd.extend(["--token", token_input.value])
+        else:
+            cmd.extend(
+                [
+                    "--username",
+                    username_input.value,
+                    "--password",
+                    password_input.value,
+                ]
+            )
 
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=300  # 5 minute timeout
+        # Add project
+        cmd.extend(["--project", refresh_project.value])
+
+        # Add date range if specified
+        if refresh_date_range.value:
+            start_date, end_date = refresh_date_range.value
+            cmd.extend(
+                [
+                    "--start-date",
+                    start_date.strftime("%Y-%m-%d"),
+                    "--end-date",
+                    end_date.strftime("%Y-%m-%d"),
+                ]
             )
 
-            if result.returncode == 0:
-                refresh_status._update(
-                    f"✅ Data refresh completed successfully! {datetime.now().strftime('%H:%M:%S')}"
-                )
-            else:
-                refresh_status._update(f"❌ Refresh failed: {result.stderr}")
+        # Add incremental flag
+        if incremental_update.value:
+            cmd.append("--incremental")
 
-        except subprocess.TimeoutExpired:
-            refresh_status._update("⏱️ Refresh timed out after 5 minutes")
-        except Exception as e:
-            refresh_status._update(f"❌ Error during refresh: {str(e)}")
+        # Start the extractor in the background; the status cell polls it
+        set_refresh_status("🔄 Refreshing data from JIRA...")
+        refresh_job["task"] = asyncio.ensure_future(run_refresh(cmd))
+    return (
+        cmd,
+        end_date,
+        run_refresh,
+        start_date,
+    )
 
-    mo.vstack([refresh_button, refresh_status if refresh_status.value else mo.md("")])
-    return cmd, refresh_button, refresh_status, result
+
+@app.cell
+def __(
+    mo,
+    refresh_button,
+    refresh_job,
+    refresh_status,
+    refresh_timer,
+    set_refresh_status,
+):
+    # Poll the background refresh on each timer tick
+    refresh_timer.value
+    _task = refresh_job["task"]
+    _running = _task is not None and not _task.done()
+    if _task is not None and _task.done() and "🔄" in refresh_status:
+        set_refresh_status(_task.result())
+
+    mo.vstack(
+        [
+            refresh_button,
+            mo.md(refresh_status) if refresh_status else mo.md(""),
+            refresh_timer if _running else mo.md(""),
+        ]
+    )
+    return
 
 
 @app.cell
@@ -254,52 +327,238 @@ def __():
 
 
 @app.cell
-def __(db_path, duckdb, json, pd, refresh_status):
-    # Load data from DuckDB (auto-reload when refresh completes)
-    reload_trigger = refresh_status.value if "✅" in refresh_status.value else ""
+def __(db_path, duckdb, mo, refresh_status):
+    # Query cells open a short-lived read-only connection each time, so the
+    # dashboard never holds the database lock between queries and other
+    # sessions or the extractor can write in the meantime. Re-running on a
+    # path change or a finished refresh re-runs every query cell.
+    mo.stop("🔄" in refresh_status, mo.md("Waiting for the data refresh to finish..."))
+
+    def open_db():
+        """Open a read-only connection to the dashboard database"""
+        return duckdb.connect(db_path.value, read_only=True)
 
     try:
-        conn = duckdb.connect(db_path.value)
+        open_db().close()
+    except Exception as e:
+        mo.stop(True, mo.md(f"❌ Could not open database: {e}"))
+    return (open_db,)
 
-        # Load issues data
-        issues_query = """
-        SELECT
-            id, key, project_key, project_name, issue_type, status, priority,
-            summary, assignee, reporter, created, updated, resolved, due_date,
-            labels, components, fix_versions, affects_versions, custom_fields,
-            extracted_at
-        FROM issues
-        WHERE 1=1
-        """
 
-        issues_df = conn.execute(issues_query).df()
+@app.cell
+def __(mo, open_db, project_filter):
+    # Filter options are read from the database so the filters themselves
+    # can be applied by the load query
 
-        # Load extraction log
-        log_df = conn.execute(
-            "SELECT * FROM extraction_log ORDER BY extraction_time DESC"
-        ).df()
+    projects = [p.strip() for p in project_filter.value.split(",") if p.strip()]
+    project_clause = (
+        f"WHERE project_key IN ({', '.join('?' for _ in projects)})" if projects else ""
+    )
 
-        conn.close()
+    try:
+        with open_db() as _conn:
+            created_min, created_max = _conn.execute(
+                f"SELECT MIN(created), MAX(created) FROM issues {project_clause}",
+                projects,
+            ).fetchone()
+            issue_type_options = [
+                row[0]
+                for row in _conn.execute(
+                    f"SELECT DISTINCT issue_type FROM issues {project_clause} ORDER BY 1",
+                    projects,
+                ).fetchall()
+                if row[0] is not None
+            ]
+            status_options = [
+                row[0]
+                for row in _conn.execute(
+                    f"SELECT DISTINCT status FROM issues {project_clause} ORDER BY 1",
+                    projects,
+                ).fetchall()
+                if row[0] is not None
+            ]
+    except Exception:
+        created_min = created_max = None
+        issue_type_options = []
+        status_options = []
 
-        # Parse custom fields JSON
-        if not issues_df.empty and "custom_fields" in issues_df.columns:
-            issues_df["story_points"] = issues_df["custom_fields"].apply(
-                lambda x: (
-                    json.loads(x).get("Story Points") if x and x != "null" else None
-                )
-            )
-            issues_df["epic_link"] = issues_df["custom_fields"].apply(
-                lambda x: json.loads(x).get("Epic Link") if x and x != "null" else None
-            )
-            issues_df["sprint"] = issues_df["custom_fields"].apply(
-                lambda x: json.loads(x).get("Sprint") if x and x != "null" else None
+    # Interactive filters
+    date_range = mo.ui.date_range(
+        start=created_min.date() if created_min else None,
+        stop=created_max.date() if created_max else None,
+        label="Date range for analysis:",
+    )
+
+    issue_types = mo.ui.multiselect(
+        options=issue_type_options,
+        label="Issue types to include:",
+        value=issue_type_options,
+    )
+
+    statuses = mo.ui.multiselect(
+        options=status_options,
+        label="Statuses to include:",
+        value=status_options,
+    )
+
+    mo.md(
+        f"""
+    ## Filters
+    
+    {date_range}
+    {issue_types}
+    {statuses}
+    """
+    )
+    return (
+        created_max,
+        created_min,
+        date_range,
+        issue_type_options,
+        issue_types,
+        project_clause,
+        projects,
+        status_options,
+        statuses,
+    )
+
+
+@app.cell
+def __(date_range, issue_types, pd, projects, statuses):
+    # WHERE clause shared by every query against the issues table
+    query_filters = []
+    query_params = []
+
+    if projects:
+        query_filters.append(f"project_key IN ({', '.join('?' for _ in projects)})")
+        query_params.extend(projects)
+
+    if date_range.value:
+        _start_date, _end_date = date_range.value
+        # Half-open timestamp range on the raw column, so no per-row cast
+        query_filters.append("created >= ? AND created < ?")
+        query_params.extend(
+            [
+                pd.Timestamp(_start_date),
+                pd.Timestamp(_end_date) + pd.Timedelta(days=1),
+            ]
+        )
+
+    if issue_types.value:
+        query_filters.append(
+            f"issue_type IN ({', '.join('?' for _ in issue_types.value)})"
+        )
+        query_params.extend(issue_types.value)
+
+    if statuses.value:
+        query_filters.append(f"status IN ({', '.join('?' for _ in statuses.value)})")
+        query_params.extend(statuses.value)
+
+    issues_where = " AND ".join(query_filters) if query_filters else "1=1"
+    return issues_where, query_filters, query_params
+
+
+@app.cell
+def __(functools, os, pd):
+    @functools.lru_cache(maxsize=4)
+    def load_issues(open_db, db_mtime, issues_where, query_params):
+        """Load filtered issues and the extraction log.
+
+        Cached on the connection factory and database modification time, so
+        re-running downstream cells or revisiting a filter combination skips
+        the query and parsing without opening the database at all.
+        """
+
+        with open_db() as conn:
+            # Load issues data (only the columns the analysis cells use), with
+            # the custom fields extracted from JSON by DuckDB
+            issues_df = conn.execute(
+                f"""
+                SELECT
+                    key, project_key, issue_type, status, priority, assignee,
+                    created, updated, resolved, extracted_at,
+                    TRY_CAST(
+                        json_extract_string(custom_fields, '$."Story Points"') AS DOUBLE
+                    ) AS story_points,
+                    json_extract_string(custom_fields, '$."Epic Link"') AS epic_link,
+                    json_extract_string(custom_fields, '$."Sprint"') AS sprint
+                FROM issues
+                WHERE {issues_where}
+                """,
+                list(query_params),
+            ).df()
+
+            # Story points are small values, so float32 is plenty
+            issues_df["story_points"] = pd.to_numeric(
+                issues_df["story_points"], errors="coerce", downcast="float"
             )
 
-        # Convert date columns
-        date_cols = ["created", "updated", "resolved", "due_date", "extracted_at"]
-        for col in date_cols:
+            # Load the most recent extraction log entries
+            log_df = conn.execute(
+                """
+                SELECT project_key, start_date, end_date, issues_extracted, extraction_time
+                FROM extraction_log
+                ORDER BY extraction_time DESC
+                LIMIT 10
+            """
+            ).df()
+
+        # Date columns are TIMESTAMP in the schema, so DuckDB already returns
+        # them as datetime64 and no parsing is needed here
+
+        # Cycle time is computed once here and reused by every analysis cell
+        # (float32 keeps NaN for unresolved issues at half the width)
+        issues_df["cycle_time_days"] = (
+            issues_df["resolved"] - issues_df["created"]
+        ).dt.days.astype("float32")
+
+        # Low-cardinality text columns as categoricals so filters and
+        # group-bys work on integer codes
+        category_cols = [
+            "project_key",
+            "issue_type",
+            "status",
+            "priority",
+            "assignee",
+        ]
+        for col in category_cols:
             if col in issues_df.columns:
-                issues_df[col] = pd.to_datetime(issues_df[col], errors="coerce")
+                issues_df[col] = issues_df[col].astype("category")
+
+        return issues_df, log_df
+
+    def database_mtime(db_file):
+        """Latest modification time of the database file and its WAL"""
+        mtime = os.path.getmtime(db_file)
+        wal_file = f"{db_file}.wal"
+        if os.path.exists(wal_file):
+            mtime = max(mtime, os.path.getmtime(wal_file))
+        return mtime
+
+    return database_mtime, load_issues
+
+
+@app.cell
+def __(
+    database_mtime,
+    db_path,
+    issues_where,
+    load_issues,
+    open_db,
+    pd,
+    query_params,
+):
+    # Load data from DuckDB (open_db is redefined when a refresh completes,
+    # which re-runs this cell)
+    try:
+        # Cached results are shared between runs, so downstream cells must
+        # not modify these frames in place
+        issues_df, log_df = load_issues(
+            open_db,
+            database_mtime(db_path.value),
+            issues_where,
+            tuple(query_params),
+        )
 
         data_loaded = True
 
@@ -321,28 +580,21 @@ def __(db_path, duckdb, json, pd, refresh_status):
 
     load_message
     return (
-        conn,
         data_loaded,
-        date_cols,
         issues_df,
-        issues_query,
         last_refresh,
         load_message,
         log_df,
-        reload_trigger,
     )
 
 
 @app.cell
-def __(data_loaded, issues_df, mo, project_filter):
+def __(data_loaded, issues_df, mo):
     if not data_loaded or issues_df.empty:
         mo.stop(True, "No data available. Please check your database path.")
 
-    # Apply project filter if specified
-    filtered_df = issues_df.copy()
-    if project_filter.value.strip():
-        projects = [p.strip() for p in project_filter.value.split(",")]
-        filtered_df = filtered_df[filtered_df["project_key"].isin(projects)]
+    # Filters are already applied by the load query
+    filtered_df = issues_df
 
     mo.md(
         f"""
@@ -353,100 +605,64 @@ def __(data_loaded, issues_df, mo, project_filter):
     **Projects:** {', '.join(filtered_df['project_key'].unique())}
     """
     )
-    return filtered_df, projects
-
-
-@app.cell
-def __(filtered_df, mo):
-    # Interactive filters
-    date_range = mo.ui.date_range(
-        start=filtered_df["created"].min().date() if not filtered_df.empty else None,
-        stop=filtered_df["created"].max().date() if not filtered_df.empty else None,
-        label="Date range for analysis:",
-    )
-
-    issue_types = mo.ui.multiselect(
-        options=(
-            list(filtered_df["issue_type"].unique()) if not filtered_df.empty else []
-        ),
-        label="Issue types to include:",
-        value=list(filtered_df["issue_type"].unique()) if not filtered_df.empty else [],
-    )
-
-    statuses = mo.ui.multiselect(
-        options=list(filtered_df["status"].unique()) if not filtered_df.empty else [],
-        label="Statuses to include:",
-        value=list(filtered_df["status"].unique()) if not filtered_df.empty else [],
-    )
-
-    mo.md(
-        f"""
-    ## Filters
-    
-    {date_range}
-    {issue_types}
-    {statuses}
-    """
-    )
-    return date_range, issue_types, statuses
+    return (filtered_df,)
 
 
 @app.cell
-def __(date_range, filtered_df, issue_types, statuses):
-    # Apply filters to create analysis dataset
-    filtered_analysis_df = filtered_df.copy()
+def __(filtered_df):
+    # Date, type and status filters are applied by the load query
+    filtered_analysis_df = filtered_df
 
-    if date_range.value:
-        start_date, end_date = date_range.value
-        filtered_analysis_df = filtered_analysis_df[
-            (filtered_analysis_df["created"].dt.date >= start_date)
-            & (filtered_analysis_df["created"].dt.date <= end_date)
-        ]
-
-    if issue_types.value:
-        filtered_analysis_df = filtered_analysis_df[
-            filtered_analysis_df["issue_type"].isin(issue_types.value)
-        ]
-
-    if statuses.value:
-        filtered_analysis_df = filtered_analysis_df[
-            filtered_analysis_df["status"].isin(statuses.value)
-        ]
-
-    # Calculate cycle time for resolved issues
+    # Resolved issues (cycle_time_days is computed at load time)
     filtered_resolved_df = filtered_analysis_df[
         filtered_analysis_df["resolved"].notna()
-    ].copy()
-    if not filtered_resolved_df.empty:
-        filtered_resolved_df["cycle_time_days"] = (
-            filtered_resolved_df["resolved"] - filtered_resolved_df["created"]
-        ).dt.days
+    ]
 
     filtered_analysis_df
     return filtered_analysis_df, filtered_resolved_df
 
 
 @app.cell
-def __(filtered_analysis_df, mo, px):
+def __(
+    filtered_analysis_df,
+    issues_where,
+    mo,
+    open_db,
+    pd,
+    px,
+    query_params,
+):
     mo.md("## Team Velocity Analysis")
 
     if filtered_analysis_df.empty:
         mo.md("No data available for velocity analysis.")
     else:
-        # Story points by sprint/month
-        velocity_df = filtered_analysis_df[
-            filtered_analysis_df["story_points"].notna()
-        ].copy()
-
-        if not velocity_df.empty:
-            # Group by month for velocity tracking
-            velocity_df["month"] = velocity_df["resolved"].dt.to_period("M").astype(str)
-            monthly_velocity = (
-                velocity_df.groupby(["project_key", "month"])["story_points"]
-                .sum()
-                .reset_index()
-            )
+        # Story points per project and resolution month, aggregated in DuckDB
+        velocity_query = f"""
+        SELECT project_key, month_key, SUM(story_points) AS story_points
+        FROM (
+            SELECT
+                project_key,
+                year(resolved) * 100 + month(resolved) AS month_key,
+                TRY_CAST(
+                    json_extract_string(custom_fields, '$."Story Points"') AS DOUBLE
+                ) AS story_points
+            FROM issues
+            WHERE {issues_where} AND resolved IS NOT NULL
+        )
+        WHERE story_points IS NOT NULL
+        GROUP BY project_key, month_key
+        ORDER BY project_key, month_key
+        """
+        with open_db() as _conn:
+            monthly_velocity = _conn.execute(velocity_query, query_params).df()
 
+        # Format the YYYYMM keys only for the aggregated rows
+        monthly_velocity["month"] = pd.to_datetime(
+            monthly_velocity["month_key"].astype(str), format="%Y%m"
+        ).dt.strftime("%Y-%m")
+
+        if not monthly_velocity.empty:
             # Velocity trend chart
             fig_velocity = px.line(
                 monthly_velocity,
@@ -461,7 +677,7 @@ def __(filtered_analysis_df, mo, px):
             mo.ui.plotly(fig_velocity)
         else:
             mo.md("No story points data available for velocity analysis.")
-    return fig_velocity, monthly_velocity, velocity_df
+    return fig_velocity, monthly_velocity, velocity_query
 
 
 @app.cell
@@ -475,20 +691,18 @@ def __(filtered_analysis_df, mo, px):
         estimation_df = filtered_analysis_df[
             (filtered_analysis_df["story_points"].notna())
             & (filtered_analysis_df["resolved"].notna())
-        ].copy()
+        ]
 
         if not estimation_df.empty:
-            estimation_df["cycle_time_days"] = (
-                estimation_df["resolved"] - estimation_df["created"]
-            ).dt.days
-
-            # Scatter plot: Story Points vs Cycle Time
+            # Scatter plot: Story Points vs Cycle Time (WebGL for large sets,
+            # where SVG rendering becomes the bottleneck)
             fig_estimation = px.scatter(
                 estimation_df,
                 x="story_points",
                 y="cycle_time_days",
                 color="issue_type",
-                hover_data=["key", "summary"],
+                hover_data=["key"],
+                render_mode="webgl" if len(estimation_df) > 2000 else "auto",
                 title="Estimation Accuracy: Story Points vs Actual Cycle Time",
                 labels={
                     "story_points": "Story Points (Estimate)",
@@ -506,10 +720,41 @@ def __(filtered_analysis_df, mo, px):
 
 
 @app.cell
-def __(filtered_analysis_df, go, make_subplots, mo):
+def __(
+    filtered_analysis_df,
+    go,
+    issues_where,
+    make_subplots,
+    mo,
+    open_db,
+    query_params,
+):
     mo.md("## Issue Distribution Analysis")
 
     if not filtered_analysis_df.empty:
+        # All four breakdowns in one query over the filtered issues
+        distribution_query = f"""
+        WITH filtered AS (
+            SELECT status, issue_type, priority, project_key
+            FROM issues
+            WHERE {issues_where}
+        )
+        SELECT 'status' AS dim, status AS value, COUNT(*) AS count
+        FROM filtered WHERE status IS NOT NULL GROUP BY status
+        UNION ALL
+        SELECT 'issue_type', issue_type, COUNT(*)
+        FROM filtered WHERE issue_type IS NOT NULL GROUP BY issue_type
+        UNION ALL
+        SELECT 'priority', priority, COUNT(*)
+        FROM filtered WHERE priority IS NOT NULL GROUP BY priority
+        UNION ALL
+        SELECT 'project_key', project_key, COUNT(*)
+        FROM filtered WHERE project_key IS NOT NULL GROUP BY project_key
+        ORDER BY dim, count DESC
+        """
+        with open_db() as _conn:
+            distribution_counts = _conn.execute(distribution_query, query_params).df()
+
         # Create subplots for various distributions
         fig_dist = make_subplots(
             rows=2,
@@ -527,29 +772,33 @@ def __(filtered_analysis_df, go, make_subplots, mo):
         )
 
         # Status distribution
-        status_counts = filtered_analysis_df["status"].value_counts()
+        status_counts = distribution_counts[distribution_counts["dim"] == "status"]
         fig_dist.add_trace(
             go.Pie(
-                labels=status_counts.index, values=status_counts.values, name="Status"
+                labels=status_counts["value"],
+                values=status_counts["count"],
+                name="Status",
             ),
             row=1,
             col=1,
         )
 
         # Type distribution
-        type_counts = filtered_analysis_df["issue_type"].value_counts()
+        type_counts = distribution_counts[distribution_counts["dim"] == "issue_type"]
         fig_dist.add_trace(
-            go.Pie(labels=type_counts.index, values=type_counts.values, name="Type"),
+            go.Pie(
+                labels=type_counts["value"], values=type_counts["count"], name="Type"
+            ),
             row=1,
             col=2,
         )
 
         # Priority distribution
-        priority_counts = filtered_analysis_df["priority"].value_counts()
+        priority_counts = distribution_counts[distribution_counts["dim"] == "priority"]
         fig_dist.add_trace(
             go.Pie(
-                labels=priority_counts.index,
-                values=priority_counts.values,
+                labels=priority_counts["value"],
+                values=priority_counts["count"],
                 name="Priority",
             ),
             row=2,
@@ -557,11 +806,13 @@ def __(filtered_analysis_df, go, make_subplots, mo):
         )
 
         # Project distribution
-        project_counts = filtered_analysis_df["project_key"].value_counts()
+        project_counts = distribution_counts[
+            distribution_counts["dim"] == "project_key"
+        ]
         fig_dist.add_trace(
             go.Pie(
-                labels=project_counts.index,
-                values=project_counts.values,
+                labels=project_counts["value"],
+                values=project_counts["count"],
                 name="Project",
             ),
             row=2,
@@ -573,11 +824,28 @@ def __(filtered_analysis_df, go, make_subplots, mo):
         mo.ui.plotly(fig_dist)
     else:
         mo.md("No data available for distribution analysis.")
-    return fig_dist, priority_counts, project_counts, status_counts, type_counts
+    return (
+        distribution_counts,
+        distribution_query,
+        fig_dist,
+        priority_counts,
+        project_counts,
+        status_counts,
+        type_counts,
+    )
 
 
 @app.cell
-def __(filtered_analysis_df, mo, px, filtered_resolved_df):
+def __(
+    filtered_analysis_df,
+    filtered_resolved_df,
+    issues_where,
+    mo,
+    open_db,
+    pd,
+    px,
+    query_params,
+):
     mo.md("## Cycle Time Analysis")
 
     if not filtered_resolved_df.empty:
@@ -591,16 +859,24 @@ def __(filtered_analysis_df, mo, px, filtered_resolved_df):
         )
         fig_cycle.update_layout(height=400)
 
-        # Cycle time trend over time
-        cycle_trend_df = filtered_resolved_df.copy()
-        cycle_trend_df["resolved_month"] = (
-            cycle_trend_df["resolved"].dt.to_period("M").astype(str)
-        )
-        cycle_avg_time = (
-            cycle_trend_df.groupby("resolved_month")["cycle_time_days"]
-            .mean()
-            .reset_index()
-        )
+        # Cycle time trend over time, aggregated in DuckDB (whole days, as
+        # in cycle_time_days)
+        cycle_trend_query = f"""
+        SELECT
+            year(resolved) * 100 + month(resolved) AS month_key,
+            AVG(floor((epoch(resolved) - epoch(created)) / 86400)) AS cycle_time_days
+        FROM issues
+        WHERE {issues_where} AND resolved IS NOT NULL
+        GROUP BY month_key
+        ORDER BY month_key
+        """
+        with open_db() as _conn:
+            cycle_avg_time = _conn.execute(cycle_trend_query, query_params).df()
+
+        # Format the YYYYMM keys only for the aggregated rows
+        cycle_avg_time["resolved_month"] = pd.to_datetime(
+            cycle_avg_time["month_key"].astype(str), format="%Y%m"
+        ).dt.strftime("%Y-%m")
 
         fig_cycle_trend = px.line(
             cycle_avg_time,
@@ -617,19 +893,23 @@ def __(filtered_analysis_df, mo, px, filtered_resolved_df):
         mo.vstack([mo.ui.plotly(fig_cycle), mo.ui.plotly(fig_cycle_trend)])
     else:
         mo.md("No resolved issues available for cycle time analysis.")
-    return cycle_avg_time, cycle_trend_df, fig_cycle, fig_cycle_trend
+    return (
+        cycle_avg_time,
+        cycle_trend_query,
+        fig_cycle,
+        fig_cycle_trend,
+    )
 
 
 @app.cell
-def __(filtered_analysis_df, mo):
+def __(filtered_analysis_df, filtered_resolved_df, mo):
     mo.md("## Key Metrics Summary")
 
     if not filtered_analysis_df.empty:
-        # Calculate key metrics
+        # Calculate key metrics (reusing the resolved subset rather than
+        # re-selecting it from the analysis frame)
         summary_total_issues = len(filtered_analysis_df)
-        summary_resolved_issues = len(
-            filtered_analysis_df[filtered_analysis_df["resolved"].notna()]
-        )
+        summary_resolved_issues = len(filtered_resolved_df)
         summary_resolution_rate = (
             (summary_resolved_issues / summary_total_issues * 100)
             if summary_total_issues > 0
@@ -648,10 +928,8 @@ def __(filtered_analysis_df, mo):
         )
 
         summary_avg_cycle_time = (
-            filtered_analysis_df[filtered_analysis_df["resolved"].notna()][
-                "cycle_time_days"
-            ].mean()
-            if "cycle_time_days" in filtered_analysis_df.columns
+            filtered_resolved_df["cycle_time_days"].mean()
+            if "cycle_time_days" in filtered_resolved_df.columns
             else 0
         )
 
@@ -699,21 +977,11 @@ def __(log_df, mo, pd):
                 display_log["extraction_time"]
             ).dt.strftime("%Y-%m-%d %H:%M:%S")
 
-        # Show recent extractions
-        recent_extractions = display_log.head(10)[
-            [
-                "project_key",
-                "start_date",
-                "end_date",
-                "issues_extracted",
-                "extraction_time",
-            ]
-        ]
-
-        mo.ui.table(recent_extractions, label="Recent Data Extractions (Last 10)")
+        # Show recent extractions (already limited to 10 by the query)
+        mo.ui.table(display_log, label="Recent Data Extractions (Last 10)")
     else:
         mo.md("No extraction history available.")
-    return display_log, recent_extractions
+    return (display_log,)
 
 
 @app.cell
@@ -18,13 +18,63 @@ import sys
 import json
 import requests
 import duckdb
+import pandas as pd
 import argparse
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import functools
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from operator import itemgetter
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Generator, List, Optional, Any, Union
 
 # from urllib.parse import urljoin  # unused
 import logging
 
+try:
+    # orjson parses and serializes several times faster than the stdlib
+    import orjson
+
+    def json_loads(data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+    def json_dumps(obj: Any, indent: bool = False) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+
+except ImportError:
+
+    def json_loads(data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    def json_dumps(obj: Any, indent: bool = False) -> str:
+        return json.dumps(obj, indent=2 if indent else None)
+
+
+# Column order of the rows built by JIRAExtractor.issue_parser
+ISSUE_COLUMNS = (
+    "id",
+    "key",
+    "project_key",
+    "project_name",
+    "issue_type",
+    "status",
+    "priority",
+    "summary",
+    "description",
+    "assignee",
+    "reporter",
+    "created",
+    "updated",
+    "resolved",
+    "due_date",
+    "labels",
+    "components",
+    "fix_versions",
+    "affects_versions",
+    "custom_fields",
+)
+
 
 class JIRAExtractor:
     def __init__(
@@ -34,11 +84,21 @@ class JIRAExtractor:
         username: Optional[str] = None,
         password: Optional[str] = None,
         db_path: str = "jira_data.duckdb",
+        max_workers: int = 8,
     ):
         self.base_url = base_url.rstrip("/")
         self.db_path = db_path
+        self.max_workers = max_workers
         self.session = requests.Session()
 
+        # Search pages are large JSON documents that compress very well
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+
+        # One pooled connection per page-fetching thread
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
         # Configure authentication
         if token:
             # Use PAT (Personal Access Token)
@@ -54,7 +114,8 @@ class JIRAExtractor:
         else:
             raise ValueError("Either token or username/password must be provided")
 
-        # Initialize database
+        # Initialize database; the connection is kept open until close()
+        self.conn = duckdb.connect(self.db_path)
         self.init_database()
 
         # Setup logging
@@ -65,14 +126,14 @@ class JIRAExtractor:
 
     def init_database(self):
         """Initialize DuckDB database with required tables"""
-        conn = duckdb.connect(self.db_path)
+        conn = self.conn
 
         # Create issues table
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS issues (
                 id VARCHAR PRIMARY KEY,
-                key VARCHAR UNIQUE,
+                key VARCHAR,
                 project_key VARCHAR,
                 project_name VARCHAR,
                 issue_type VARCHAR,
@@ -110,14 +171,16 @@ class JIRAExtractor:
         """
         )
 
-        conn.close()
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
 
     def test_connection(self) -> bool:
         """Test connection to JIRA server"""
         try:
             response = self.session.get(f"{self.base_url}/rest/api/2/serverInfo")
             response.raise_for_status()
-            server_info = response.json()
+            server_info = json_loads(response.content)
             self.logger.info(
                 f"Connected to JIRA Server {server_info.get('version', 'Unknown')} using {self.auth_method} authentication"
             )
@@ -131,7 +194,7 @@ class JIRAExtractor:
         try:
             response = self.session.get(f"{self.base_url}/rest/api/2/project")
             response.raise_for_status()
-            projects = response.json()
+            projects = json_loads(response.content)
             return [{"key": p["key"], "name": p["name"]} for p in projects]
         except Exception as e:
             self.logger.error(f"Failed to get projects: {e}")
@@ -142,7 +205,7 @@ class JIRAExtractor:
         try:
             response = self.session.get(f"{self.base_url}/rest/api/2/field")
             response.raise_for_status()
-            fields = response.json()
+            fields = json_loads(response.content)
 
             custom_fields = {}
             for field in fields:
@@ -162,6 +225,8 @@ class JIRAExtractor:
         fields: Optional[List[str]] = None,
         custom_field_mapping: Optional[Dict[str, str]] = None,
         incremental: bool = False,
+        include_changelog: bool = False,
+        include_description: bool = True,
     ) -> int:
         """Extract issues from JIRA project"""
 
@@ -170,8 +235,7 @@ class JIRAExtractor:
 
         if incremental:
             # Get last extraction date for this project
-            conn = duckdb.connect(self.db_path)
-            result = conn.execute(
+            result = self.conn.execute(
                 """
                 SELECT MAX(extraction_time) as last_extraction
                 FROM extraction_log
@@ -179,7 +243,6 @@ class JIRAExtractor:
             """,
                 [project_key],
             ).fetchone()
-            conn.close()
 
             if result and result[0]:
                 last_extraction = result[0]
@@ -197,8 +260,8 @@ class JIRAExtractor:
         # Default fields to extract
         default_fields = [
             "key",
+            "project",
             "summary",
-            "description",
             "issuetype",
             "status",
             "priority",
@@ -214,8 +277,12 @@ class JIRAExtractor:
             "versions",
         ]
 
+        # Descriptions are often several KB per issue and unused by the dashboard
+        if include_description:
+            default_fields.insert(2, "description")
+
         if fields:
-            extract_fields = fields
+            extract_fields = list(fields)
         else:
             extract_fields = default_fields
 
@@ -224,44 +291,54 @@ class JIRAExtractor:
             extract_fields.extend(custom_field_mapping.keys())
 
         issues_extracted = 0
-        start_at = 0
         max_results = 100
+        search_body: Dict[str, Any] = {
+            "jql": jql,
+            "maxResults": max_results,
+            "fields": extract_fields,
+        }
+
+        # The change history is not stored, and inlining it multiplies page size
+        if include_changelog:
+            search_body["expand"] = ["changelog"]
 
-        conn = duckdb.connect(self.db_path)
+        conn = self.conn
 
+        # Stage, merge, log and re-aggregate in a single transaction
+        conn.begin()
         try:
-            while True:
-                # Make API request
-                params = {
-                    "jql": jql,
-                    "startAt": str(start_at),
-                    "maxResults": str(max_results),
-                    "fields": ",".join(extract_fields),
-                    "expand": "changelog",
-                }
-
-                response = self.session.get(
-                    f"{self.base_url}/rest/api/2/search", params=params
-                )
-                response.raise_for_status()
-                data = response.json()
+            # Pages are bulk-loaded into a staging table and merged once at the end
+            columns = ", ".join(ISSUE_COLUMNS)
+            conn.execute(
+                f"CREATE OR REPLACE TEMP TABLE issues_stage AS "
+                f"SELECT {columns} FROM issues LIMIT 0"
+            )
 
-                issues = data.get("issues", [])
-                if not issues:
-                    break
+            parse_issue = self.issue_parser(custom_field_mapping)
 
-                # Process and insert issues
-                for issue in issues:
-                    self.insert_issue(conn, issue, custom_field_mapping)
-                    issues_extracted += 1
+            # Pages are fetched concurrently and staged as they complete
+            with closing(self._fetch_pages(search_body, max_results)) as pages:
+                for page_number, data in enumerate(pages, 1):
+                    issues = data.get("issues", [])
+                    if not issues:
+                        continue
 
-                self.logger.info(f"Extracted {issues_extracted} issues so far...")
+                    # Stage the whole page in one insert
+                    page_df = pd.DataFrame.from_records(
+                        [parse_issue(issue) for issue in issues],
+                        columns=ISSUE_COLUMNS,
+                    )
+                    conn.from_df(page_df).insert_into("issues_stage")
+                    issues_extracted += len(issues)
 
-                # Check if we've got all issues
-                if start_at + max_results >= data["total"]:
-                    break
+                    # Report progress every 10 pages rather than on every page
+                    if page_number % 10 == 0:
+                        self.logger.info(
+                            "Extracted %d issues so far...", issues_extracted
+                        )
 
-                start_at += max_results
+            self.logger.info("Extracted %d issues, merging", issues_extracted)
+            self.merge_staged_issues()
 
             # Log extraction - generate ID manually
             log_id = conn.execute(
@@ -275,121 +352,130 @@ class JIRAExtractor:
                 [log_id, project_key, start_date, end_date, issues_extracted],
             )
 
+            conn.commit()
+
         except Exception as e:
+            conn.rollback()
             self.logger.error(f"Failed to extract issues: {e}")
             raise
-        finally:
-            conn.close()
 
         return issues_extracted
 
-    def insert_issue(
-        self,
-        conn: duckdb.DuckDBPyConnection,
-        issue: Dict[str, Any],
-        custom_field_mapping: Optional[Dict[str, str]] = None,
-    ):
-        """Insert or update issue in database"""
-        fields = issue["fields"]
-
-        # Extract standard fields
-        issue_data = {
-            "id": issue["id"],
-            "key": issue["key"],
-            "project_key": fields.get("project", {}).get("key"),
-            "project_name": fields.get("project", {}).get("name"),
-            "issue_type": fields.get("issuetype", {}).get("name"),
-            "status": fields.get("status", {}).get("name"),
-            "priority": (
-                fields.get("priority", {}).get("name")
-                if fields.get("priority")
-                else None
-            ),
-            "summary": fields.get("summary"),
-            "description": fields.get("description"),
-            "assignee": (
-                fields.get("assignee", {}).get("displayName")
-                if fields.get("assignee")
-                else None
-            ),
-            "reporter": (
-                fields.get("reporter", {}).get("displayName")
-                if fields.get("reporter")
-                else None
-            ),
-            "created": self.parse_jira_datetime(fields.get("created")),
-            "updated": self.parse_jira_datetime(fields.get("updated")),
-            "resolved": self.parse_jira_datetime(fields.get("resolutiondate")),
-            "due_date": self.parse_jira_datetime(fields.get("duedate")),
-            "labels": [label for label in fields.get("labels", [])],
-            "components": [comp["name"] for comp in fields.get("components", [])],
-            "fix_versions": [ver["name"] for ver in fields.get("fixVersions", [])],
-            "affects_versions": [ver["name"] for ver in fields.get("versions", [])],
-        }
-
-        # Extract custom fields
-        custom_fields = {}
-        if custom_field_mapping:
-            for field_id, display_name in custom_field_mapping.items():
-                if field_id in fields:
-                    custom_fields[display_name] = fields[field_id]
+    def _fetch_pages(
+        self, search_body: Dict[str, Any], max_results: int
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Yield every page of search results, in completion order
 
-        issue_data["custom_fields"] = (
-            json.dumps(custom_fields) if custom_fields else None
+        At most 2 * max_workers requests are in flight, and each page is handed
+        over as soon as it completes, so memory is bounded by the worker count
+        rather than the size of the project.
+        """
+        # The first page tells us how many more pages to fetch
+        first_page = self._fetch_page(search_body, 0)
+        offsets = iter(range(max_results, first_page["total"], max_results))
+        yield first_page
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {
+                executor.submit(self._fetch_page, search_body, start_at)
+                for start_at in islice(offsets, 2 * self.max_workers)
+            }
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for start_at in islice(offsets, len(done)):
+                        pending.add(
+                            executor.submit(self._fetch_page, search_body, start_at)
+                        )
+                    for future in done:
+                        yield future.result()
+            except BaseException:
+                # Don't let queued pages keep hitting JIRA before the executor
+                # shuts down and the transaction rolls back
+                for future in pending:
+                    future.cancel()
+                raise
+
+    def _fetch_page(self, search_body: Dict[str, Any], start_at: int) -> Dict[str, Any]:
+        """Fetch one page of search results starting at the given offset"""
+        # POST keeps long JQL and field lists out of the query string
+        response = self.session.post(
+            f"{self.base_url}/rest/api/2/search",
+            json=dict(search_body, startAt=start_at),
         )
+        response.raise_for_status()
+        return json_loads(response.content)
+
+    def issue_parser(
+        self, custom_field_mapping: Optional[Dict[str, str]] = None
+    ) -> Callable[[Dict[str, Any]], tuple]:
+        """Build a function converting an API issue into a row ordered as ISSUE_COLUMNS
+
+        The datetime parser and custom field mapping are bound once per
+        extraction instead of being looked up again for every issue.
+        """
+        parse_datetime = self.parse_jira_datetime
+        name_of = itemgetter("name")
+        custom_field_items = tuple((custom_field_mapping or {}).items())
+
+        def parse_issue(issue: Dict[str, Any]) -> tuple:
+            fields = issue["fields"]
+            get = fields.get
+            project = get("project", {})
+            priority = get("priority")
+            assignee = get("assignee")
+            reporter = get("reporter")
+
+            custom_fields = {
+                display_name: fields[field_id]
+                for field_id, display_name in custom_field_items
+                if field_id in fields
+            }
+
+            return (
+                issue["id"],
+                issue["key"],
+                project.get("key"),
+                project.get("name"),
+                get("issuetype", {}).get("name"),
+                get("status", {}).get("name"),
+                priority.get("name") if priority else None,
+                get("summary"),
+                get("description"),
+                assignee.get("displayName") if assignee else None,
+                reporter.get("displayName") if reporter else None,
+                parse_datetime(get("created")),
+                parse_datetime(get("updated")),
+                parse_datetime(get("resolutiondate")),
+                parse_datetime(get("duedate")),
+                get("labels") or [],
+                list(map(name_of, get("components") or ())),
+                list(map(name_of, get("fixVersions") or ())),
+                list(map(name_of, get("versions") or ())),
+                json_dumps(custom_fields) if custom_fields else None,
+            )
+
+        return parse_issue
 
-        # Insert or update issue on conflict
+    def merge_staged_issues(self):
+        """Replace previously extracted copies of the staged issues"""
+        conn = self.conn
+        columns = ", ".join(ISSUE_COLUMNS)
+
+        # Two set-based statements instead of an upsert probing the indexes
+        # row by row; both run inside the extraction transaction
+        conn.execute("DELETE FROM issues WHERE id IN (SELECT id FROM issues_stage)")
+
+        # An issue can appear on two pages if it moves while paging; keep the
+        # most recently updated copy so each id is only inserted once
         conn.execute(
-            """
-            INSERT INTO issues (
-                id, key, project_key, project_name, issue_type, status, priority,
-                summary, description, assignee, reporter, created, updated, resolved,
-                due_date, labels, components, fix_versions, affects_versions, custom_fields
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT (id) DO UPDATE SET
-                key = EXCLUDED.key,
-                project_key = EXCLUDED.project_key,
-                project_name = EXCLUDED.project_name,
-                issue_type = EXCLUDED.issue_type,
-                status = EXCLUDED.status,
-                priority = EXCLUDED.priority,
-                summary = EXCLUDED.summary,
-                description = EXCLUDED.description,
-                assignee = EXCLUDED.assignee,
-                reporter = EXCLUDED.reporter,
-                created = EXCLUDED.created,
-                updated = EXCLUDED.updated,
-                resolved = EXCLUDED.resolved,
-                due_date = EXCLUDED.due_date,
-                labels = EXCLUDED.labels,
-                components = EXCLUDED.components,
-                fix_versions = EXCLUDED.fix_versions,
-                affects_versions = EXCLUDED.affects_versions,
-                custom_fields = EXCLUDED.custom_fields
-        """,
-            [
-                issue_data["id"],
-                issue_data["key"],
-                issue_data["project_key"],
-                issue_data["project_name"],
-                issue_data["issue_type"],
-                issue_data["status"],
-                issue_data["priority"],
-                issue_data["summary"],
-                issue_data["description"],
-                issue_data["assignee"],
-                issue_data["reporter"],
-                issue_data["created"],
-                issue_data["updated"],
-                issue_data["resolved"],
-                issue_data["due_date"],
-                issue_data["labels"],
-                issue_data["components"],
-                issue_data["fix_versions"],
-                issue_data["affects_versions"],
-                issue_data["custom_fields"],
-            ],
+            f"""
+            INSERT INTO issues ({columns})
+            SELECT {columns} FROM issues_stage
+            QUALIFY row_number() OVER (PARTITION BY id ORDER BY updated DESC) = 1
+        """
         )
+        conn.execute("DROP TABLE issues_stage")
 
     def parse_jira_datetime(self, datetime_str: Optional[str]) -> Optional[datetime]:
         """Parse JIRA datetime string to Python datetime"""
@@ -397,7 +483,27 @@ class JIRAExtractor:
             return None
 
         try:
-            # JIRA typically returns ISO format with timezone
+            # Python 3.11+ parses JIRA's "+HHMM" offsets natively
+            return datetime.fromisoformat(datetime_str)
+        except ValueError:
+            pass
+
+        try:
+            # Older versions only accept "+HH:MM"; JIRA's timestamps are fixed
+            # width ("YYYY-MM-DDTHH:MM:SS.sss+HHMM") so slice them directly
+            if len(datetime_str) == 28 and datetime_str[19] == ".":
+                return datetime(
+                    int(datetime_str[0:4]),
+                    int(datetime_str[5:7]),
+                    int(datetime_str[8:10]),
+                    int(datetime_str[11:13]),
+                    int(datetime_str[14:16]),
+                    int(datetime_str[17:19]),
+                    int(datetime_str[20:23]) * 1000,
+                    tzinfo=parse_utc_offset(datetime_str[23:]),
+                )
+
+            # Anything else (e.g. date-only due dates) goes through fromisoformat
             return datetime.fromisoformat(
                 datetime_str.replace("Z", "+00:00").replace(".000", "")
             )
@@ -405,18 +511,29 @@ class JIRAExtractor:
             return None
 
 
+@functools.lru_cache(maxsize=8)
+def parse_utc_offset(offset: str) -> timezone:
+    """Convert a "+HHMM" / "-HHMM" UTC offset to a timezone"""
+    minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+    if offset[0] == "-":
+        minutes = -minutes
+    elif offset[0] != "+":
+        raise ValueError(f"Invalid UTC offset: {offset}")
+    return timezone(timedelta(minutes=minutes))
+
+
 def load_config(config_file: str = "config.json") -> Dict[str, Any]:
     """Load configuration from file"""
     if os.path.exists(config_file):
-        with open(config_file, "r") as f:
-            return json.load(f)
+        with open(config_file, "rb") as f:
+            return json_loads(f.read())
     return {}
 
 
 def save_config(config: Dict[str, Any], config_file: str = "config.json"):
     """Save configuration to file"""
     with open(config_file, "w") as f:
-        json.dump(config, f, indent=2)
+        f.write(json_dumps(config, indent=True))
 
 
 def main():
@@ -433,6 +550,12 @@ def main():
         "--db-path", default="jira_data.duckdb", help="DuckDB file path"
     )
     parser.add_argument("--config", default="config.json", help="Configuration file")
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        help="Number of search pages to fetch concurrently",
+    )
     parser.add_argument(
         "--list-projects", action="store_true", help="List available projects"
     )
@@ -457,50 +580,57 @@ def main():
         username=args.username,
         password=args.password,
         db_path=args.db_path,
+        max_workers=args.max_workers,
     )
 
-    # Test connection
-    if not extractor.test_connection():
-        sys.exit(1)
-
-    # List projects if requested
-    if args.list_projects:
-        projects = extractor.get_projects()
-        print("\nAvailable projects:")
-        for project in projects:
-            print(f"  {project['key']}: {project['name']}")
-        return
-
-    # List custom fields if requested
-    if args.list_fields:
-        fields = extractor.get_custom_fields()
-        print("\nCustom fields:")
-        for field_id, field_name in fields.items():
-            print(f"  {field_id}: {field_name}")
-        return
-
-    # Extract issues
-    if not args.project:
-        print("Please specify a project key using --project")
-        sys.exit(1)
+    try:
+        # Test connection
+        if not extractor.test_connection():
+            sys.exit(1)
+
+        # List projects if requested
+        if args.list_projects:
+            projects = extractor.get_projects()
+            print("\nAvailable projects:")
+            for project in projects:
+                print(f"  {project['key']}: {project['name']}")
+            return
+
+        # List custom fields if requested
+        if args.list_fields:
+            fields = extractor.get_custom_fields()
+            print("\nCustom fields:")
+            for field_id, field_name in fields.items():
+                print(f"  {field_id}: {field_name}")
+            return
+
+        # Extract issues
+        if not args.project:
+            print("Please specify a project key using --project")
+            sys.exit(1)
+
+        # Get custom field mapping from config
+        custom_field_mapping = config.get("custom_field_mapping", {})
+        fields = config.get("fields")
+        include_description = config.get("include_description", True)
 
-    # Get custom field mapping from config
-    custom_field_mapping = config.get("custom_field_mapping", {})
-    fields = config.get("fields")
+        try:
+            count = extractor.extract_issues(
+                project_key=args.project,
+                start_date=args.start_date,
+                end_date=args.end_date,
+                fields=fields,
+                custom_field_mapping=custom_field_mapping,
+                incremental=args.incremental,
+                include_description=include_description,
+            )
+            print(f"Successfully extracted {count} issues from project {args.project}")
+        except Exception as e:
+            print(f"Error extracting issues: {e}")
+            sys.exit(1)
 
-    try:
-        count = extractor.extract_issues(
-            project_key=args.project,
-            start_date=args.start_date,
-            end_date=args.end_date,
-            fields=fields,
-            custom_field_mapping=custom_field_mapping,
-            incremental=args.incremental,
-        )
-        print(f"Successfully extracted {count} issues from project {args.project}")
-    except Exception as e:
-        print(f"Error extracting issues: {e}")
-        sys.exit(1)
+    finally:
+        extractor.close()
 
 
 if __name__ == "__main__":
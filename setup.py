@@ -25,7 +25,7 @@ def read_requirements():
     except FileNotFoundError:
         return [
             "requests>=2.28.0",
-            "duckdb>=0.8.0",
+            "duckdb>=1.2.0",
             "marimo>=0.8.0",
             "plotly>=5.17.0",
             "pandas>=2.0.0",